@@ -1,7 +1,18 @@
+import argparse
 import json
+import os
 import sqlite3
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
 from pathlib import Path
 from datetime import datetime
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
+
+try:
+    import orjson
+except ImportError:  # optional speedup, stdlib json is the fallback
+    orjson = None
 
 
 PROJECT_DIR = Path(__file__).resolve().parent
@@ -13,13 +24,135 @@ EVENTS_DIR = DATA_DIR / "events"
 DB_PATH = PROJECT_DIR / "statsbomb_raw.sqlite"
 
 
-def load_json(path: Path):
-    with path.open("r", encoding="utf-8") as f:
+# Flat per-event columns, extracted at ingest so exports need no JSON parsing
+FLAT_COLUMNS = [
+    # context
+    ("play_pattern", "TEXT"),
+    # locations
+    ("x", "REAL"), ("y", "REAL"), ("end_x", "REAL"), ("end_y", "REAL"),
+    # pass
+    ("pass_length", "REAL"), ("pass_height", "TEXT"), ("pass_outcome", "TEXT"),
+    ("pass_cross", "BOOLEAN"), ("pass_switch", "BOOLEAN"),
+    # shot
+    ("shot_outcome", "TEXT"), ("shot_body_part", "TEXT"), ("shot_type", "TEXT"), ("shot_xg", "REAL"),
+    # carry
+    ("carry_length", "REAL"),
+    # duel / foul
+    ("duel_type", "TEXT"), ("foul_committed", "BOOLEAN"), ("foul_won", "BOOLEAN"),
+]
+FLAT_COLUMN_NAMES = [name for name, _ in FLAT_COLUMNS]
+
+# matches_raw names computed by SQLite from the stored JSON (VIRTUAL: evaluated on read, nothing stored)
+MATCH_GENERATED_COLUMNS = [
+    ("competition_name", "coalesce(json_extract(json, '$.competition.competition_name'), "
+                         "json_extract(json, '$.competition.name'))"),
+    ("season_name", "coalesce(json_extract(json, '$.season.season_name'), json_extract(json, '$.season.name'))"),
+    ("country_name", "coalesce(json_extract(json, '$.country.name'), "
+                     "json_extract(json, '$.competition.country_name'))"),
+]
+
+MATCH_COLUMNS = [
+    "match_id", "competition_id", "season_id", "match_date", "home_team_id", "away_team_id",
+    "json", "source_file", "ingested_at",
+]
+
+EVENT_COLUMNS = [
+    "match_id", "event_id", "index_in_file", "period", "timestamp", "minute", "second",
+    "type_name", "possession", "team_id", "player_id",
+    *FLAT_COLUMN_NAMES,
+    "json",
+]
+
+
+def upsert_sql(table: str, columns: list, key: list) -> str:
+    # Update in place on conflict: unlike INSERT OR REPLACE there is no delete + re-insert
+    # of the whole row (and all of its index entries) when re-ingesting
+    updates = ", ".join(f"{c}=excluded.{c}" for c in columns if c not in key)
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))}) "
+        f"ON CONFLICT({', '.join(key)}) DO UPDATE SET {updates}"
+    )
+
+
+UPSERT_MATCHES_SQL = upsert_sql("matches_raw", MATCH_COLUMNS, ["match_id"])
+UPSERT_EVENTS_SQL = upsert_sql("events_raw", EVENT_COLUMNS, ["match_id", "event_id"])
+UPSERT_EVENT_FILES_SQL = upsert_sql("event_files_raw", ["match_id", "source_file", "ingested_at"], ["match_id"])
+
+
+def load_json(path: Union[str, Path]):
+    if orjson is not None:
+        with open(path, "rb") as f:
+            return orjson.loads(f.read())
+    with open(path, "r", encoding="utf-8") as f:
         return json.load(f)
 
 
-def ensure_schema(conn: sqlite3.Connection):
+def list_match_files(matches_dir: Path) -> List[Tuple[int, int, str]]:
+    """(competition_id, season_id, path) for every matches/<competition_id>/<season_id>.json, sorted by path."""
+    # scandir entries carry the file type from the directory listing: no per-file stat or Path objects
+    found = []
+    with os.scandir(matches_dir) as competitions:
+        for comp in competitions:
+            if not comp.is_dir():
+                continue
+            with os.scandir(comp.path) as seasons:
+                for entry in seasons:
+                    if entry.name.endswith(".json") and entry.is_file():
+                        found.append((entry.path, int(comp.name), int(entry.name[:-len(".json")])))
+    found.sort()
+    return [(competition_id, season_id, path) for path, competition_id, season_id in found]
+
+
+def list_event_files(events_dir: Path) -> Set[str]:
+    """File names present in the events dir, so matches can be checked without a stat each."""
+    if not events_dir.exists():
+        return set()
+    with os.scandir(events_dir) as entries:
+        return {entry.name for entry in entries}
+
+
+def ijson_available() -> bool:
+    try:
+        import ijson
+        return True
+    except Exception:
+        return False
+
+
+def iter_events(path: Union[str, Path]):
+    """Yield the events of one events file one at a time (requires ijson)."""
+    import ijson
+
+    with open(path, "rb") as f:
+        yield from ijson.items(f, "item", use_float=True)
+
+
+def dump_json(obj) -> bytes:
+    # UTF-8 bytes, bound by sqlite3 as a BLOB without any text decode/encode
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def configure_connection(conn: sqlite3.Connection):
+    # Bulk-load tuning: WAL + NORMAL sync avoids an fsync per commit,
+    # bigger page cache / in-memory temp keeps B-tree writes off the disk.
     conn.executescript(
+        """
+        PRAGMA journal_mode=WAL;
+        PRAGMA synchronous=NORMAL;
+        PRAGMA temp_store=MEMORY;
+        PRAGMA cache_size=-200000;
+        PRAGMA mmap_size=268435456;
+        """
+    )
+
+
+def ensure_schema_preload(conn: sqlite3.Connection, keep_raw_json: bool = True):
+    # Plain execute() rather than executescript(): executescript COMMITs first, and main() runs
+    # the migration inside the load transaction so a failed ingest leaves the old DB untouched
+    flat_ddl = "".join(f"          {name:<14} {decl},\n" for name, decl in FLAT_COLUMNS)
+    conn.execute(
         """
         CREATE TABLE IF NOT EXISTS matches_raw (
           match_id       INTEGER PRIMARY KEY,
@@ -31,8 +164,11 @@ def ensure_schema(conn: sqlite3.Connection):
           json           TEXT NOT NULL,
           source_file    TEXT,
           ingested_at    TEXT
-        );
-
+        )
+        """
+    )
+    conn.execute(
+        f"""
         CREATE TABLE IF NOT EXISTS events_raw (
           match_id       INTEGER NOT NULL,
           event_id       TEXT NOT NULL,
@@ -45,89 +181,270 @@ def ensure_schema(conn: sqlite3.Connection):
           possession     INTEGER,
           team_id        INTEGER,
           player_id      INTEGER,
-          json           TEXT NOT NULL,
-          source_file    TEXT,
-          ingested_at    TEXT,
+{flat_ddl}          json           BLOB,
           PRIMARY KEY (match_id, event_id)
-        );
+        )
+        """
+    )
+    # Per-file constants live here, not on every events_raw row
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS event_files_raw (
+          match_id       INTEGER PRIMARY KEY,
+          source_file    TEXT,
+          ingested_at    TEXT
+        )
+        """
+    )
+
+    table_info = conn.execute("PRAGMA table_info(events_raw)").fetchall()
+    existing = {r[1] for r in table_info}
+
+    # DBs created before the flat columns existed have json NOT NULL, which ALTER TABLE cannot
+    # relax; refuse before touching the schema
+    json_not_null = any(r[1] == "json" and r[3] for r in table_info)
+    if not keep_raw_json and json_not_null:
+        raise ValueError(
+            f"--no-raw-json needs a nullable events_raw.json, but {DB_PATH} was created with json NOT NULL. "
+            "Re-run without --no-raw-json, or delete the DB and ingest again."
+        )
+
+    # Add the flat columns to those DBs (filled on re-ingest)
+    for name, decl in FLAT_COLUMNS:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE events_raw ADD COLUMN {name} {decl}")
+
+    # They also carry per-row source_file/ingested_at, which the upsert no longer writes. Move
+    # them into event_files_raw (without overwriting newer rows), then clear them so
+    # event_files_raw is the only record of where and when events were ingested
+    legacy = [c for c in ("source_file", "ingested_at") if c in existing]
+    if legacy:
+        picked = ", ".join(f"max({c})" if c in legacy else "NULL" for c in ("source_file", "ingested_at"))
+        conn.execute(
+            "INSERT INTO event_files_raw (match_id, source_file, ingested_at) "
+            f"SELECT match_id, {picked} "
+            f"FROM events_raw WHERE {' OR '.join(f'{c} IS NOT NULL' for c in legacy)} "
+            # GROUP BY keeps "ON" from being parsed as a join constraint
+            "GROUP BY match_id ON CONFLICT(match_id) DO NOTHING"
+        )
+        conn.execute(
+            f"UPDATE events_raw SET {', '.join(f'{c} = NULL' for c in legacy)} "
+            f"WHERE {' OR '.join(f'{c} IS NOT NULL' for c in legacy)}"
+        )
+
+    # table_xinfo: table_info does not list generated columns
+    existing = {r[1] for r in conn.execute("PRAGMA table_xinfo(matches_raw)")}
+    for name, expr in MATCH_GENERATED_COLUMNS:
+        if name not in existing:
+            conn.execute(f"ALTER TABLE matches_raw ADD COLUMN {name} TEXT GENERATED ALWAYS AS ({expr}) VIRTUAL")
+
+
+# Secondary indexes, dropped before the load and rebuilt by create_indexes_postload;
+# idx_events_match_id is the old single-column index, which is not rebuilt
+SECONDARY_INDEXES = (
+    "idx_matches_competition_season",
+    "idx_events_match_idx",
+    "idx_events_match_id",
+    "idx_events_player_id",
+    "idx_events_type_name",
+)
+
 
-        CREATE INDEX IF NOT EXISTS idx_events_match_id ON events_raw(match_id);
+def drop_indexes_preload(conn: sqlite3.Connection):
+    # On a re-ingest the existing indexes would otherwise be updated for every upserted row.
+    # execute(), not executescript(): this runs inside the load transaction.
+    for name in SECONDARY_INDEXES:
+        conn.execute(f"DROP INDEX IF EXISTS {name}")
+
+
+def create_indexes_postload(conn: sqlite3.Connection):
+    # Built once over the loaded table instead of updated per inserted row
+    conn.executescript(
+        """
+        CREATE INDEX IF NOT EXISTS idx_matches_competition_season ON matches_raw(competition_id, season_id);
+        -- (match_id, index_in_file) lets the export read events in file order without a sort;
+        -- it also covers plain match_id lookups, so the old single-column index is not rebuilt
+        CREATE INDEX IF NOT EXISTS idx_events_match_idx ON events_raw(match_id, index_in_file);
         CREATE INDEX IF NOT EXISTS idx_events_player_id ON events_raw(player_id);
         CREATE INDEX IF NOT EXISTS idx_events_type_name ON events_raw(type_name);
         """
     )
 
 
-def upsert_match(conn, match, competition_id, season_id, source_file, ingested_at):
-    match_id = match.get("match_id")
-    match_date = match.get("match_date")
-    home_team_id = (match.get("home_team") or {}).get("home_team_id")
-    away_team_id = (match.get("away_team") or {}).get("away_team_id")
+def get_location_xy(loc: Any) -> Tuple[Optional[float], Optional[float]]:
+    if isinstance(loc, list) and len(loc) >= 2:
+        return loc[0], loc[1]
+    return None, None
+
+
+# Type-specific part of the flat row: every FLAT_COLUMNS value after play_pattern, x, y.
+# Handlers fill it by column name, so FLAT_COLUMNS can be reordered or extended freely.
+assert FLAT_COLUMN_NAMES[:3] == ["play_pattern", "x", "y"], "flatten_event builds these three itself"
+_DETAIL_SLOT = {name: i - 3 for i, name in enumerate(FLAT_COLUMN_NAMES) if i >= 3}
+_NO_DETAIL = (None,) * len(_DETAIL_SLOT)
+
+
+def _detail(**values: Any) -> Tuple[Any, ...]:
+    """Detail tuple with the named columns set and None everywhere else."""
+    row = list(_NO_DETAIL)
+    for name, value in values.items():
+        row[_DETAIL_SLOT[name]] = value
+    return tuple(row)
+
+
+def _pass_detail(ev: Dict[str, Any], x: Any, y: Any) -> Tuple[Any, ...]:
+    p = ev.get("pass")
+    if not isinstance(p, dict):
+        return _NO_DETAIL
+    end_x, end_y = get_location_xy(p.get("end_location"))
+    return _detail(
+        end_x=end_x,
+        end_y=end_y,
+        pass_length=p.get("length"),
+        pass_height=(p.get("height") or {}).get("name"),
+        pass_outcome=(p.get("outcome") or {}).get("name"),
+        pass_cross=p.get("cross"),
+        pass_switch=p.get("switch"),
+    )
 
-    conn.execute(
-        """
-        INSERT OR REPLACE INTO matches_raw
-        (match_id, competition_id, season_id, match_date, home_team_id, away_team_id, json, source_file, ingested_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        (
-            match_id,
-            competition_id,
-            season_id,
-            match_date,
-            home_team_id,
-            away_team_id,
-            json.dumps(match, ensure_ascii=False),
-            source_file,
-            ingested_at,
-        ),
+
+def _shot_detail(ev: Dict[str, Any], x: Any, y: Any) -> Tuple[Any, ...]:
+    s = ev.get("shot")
+    if not isinstance(s, dict):
+        return _NO_DETAIL
+    end_x, end_y = get_location_xy(s.get("end_location"))
+    return _detail(
+        end_x=end_x,
+        end_y=end_y,
+        shot_outcome=(s.get("outcome") or {}).get("name"),
+        shot_body_part=(s.get("body_part") or {}).get("name"),
+        shot_type=(s.get("type") or {}).get("name"),
+        shot_xg=s.get("statsbomb_xg"),
     )
 
 
-def insert_events(conn, match_id, events, source_file, ingested_at):
+def _carry_detail(ev: Dict[str, Any], x: Any, y: Any) -> Tuple[Any, ...]:
+    c = ev.get("carry")
+    if not isinstance(c, dict):
+        return _NO_DETAIL
+    end_x, end_y = get_location_xy(c.get("end_location"))
+    # simple carry length
+    carry_length = None
+    if x is not None and y is not None and end_x is not None and end_y is not None:
+        dx = float(end_x) - float(x)
+        dy = float(end_y) - float(y)
+        carry_length = (dx * dx + dy * dy) ** 0.5
+    return _detail(end_x=end_x, end_y=end_y, carry_length=carry_length)
+
+
+def _duel_detail(ev: Dict[str, Any], x: Any, y: Any) -> Tuple[Any, ...]:
+    d = ev.get("duel")
+    if not isinstance(d, dict):
+        return _NO_DETAIL
+    return _detail(duel_type=(d.get("type") or {}).get("name"))
+
+
+_FOUL_COMMITTED_DETAIL = _detail(foul_committed=True)
+_FOUL_WON_DETAIL = _detail(foul_won=True)
+
+# event type -> detail builder; every other type gets _NO_DETAIL from one dict miss
+_HANDLERS = {
+    "Pass": _pass_detail,
+    "Shot": _shot_detail,
+    "Carry": _carry_detail,
+    "Duel": _duel_detail,
+    "Foul Committed": lambda ev, x, y: _FOUL_COMMITTED_DETAIL,
+    "Foul Won": lambda ev, x, y: _FOUL_WON_DETAIL,
+}
+
+
+def flatten_event(ev: Dict[str, Any]) -> Tuple[Any, ...]:
+    """Extract one event's flat values, positionally in FLAT_COLUMNS order."""
+    x, y = get_location_xy(ev.get("location"))
+    handler = _HANDLERS.get((ev.get("type") or {}).get("name"))
+    detail = handler(ev, x, y) if handler is not None else _NO_DETAIL
+    return ((ev.get("play_pattern") or {}).get("name"), x, y) + detail
+
+
+def upsert_matches(conn, matches, competition_id, season_id, source_file, ingested_at):
     rows = []
-    for idx, ev in enumerate(events):
-        event_id = ev.get("id")
-        period = ev.get("period")
-        timestamp = ev.get("timestamp")
-        minute = ev.get("minute")
-        second = ev.get("second")
-        type_name = (ev.get("type") or {}).get("name")
-        possession = ev.get("possession")
-        team_id = (ev.get("team") or {}).get("id")
-        player_id = (ev.get("player") or {}).get("id")
+    for match in matches:
+        match_id = match.get("match_id")
+        match_date = match.get("match_date")
+        home_team_id = (match.get("home_team") or {}).get("home_team_id")
+        away_team_id = (match.get("away_team") or {}).get("away_team_id")
 
         rows.append(
             (
                 match_id,
-                event_id,
-                idx,
-                period,
-                timestamp,
-                minute,
-                second,
-                type_name,
-                possession,
-                team_id,
-                player_id,
-                json.dumps(ev, ensure_ascii=False),
+                competition_id,
+                season_id,
+                match_date,
+                home_team_id,
+                away_team_id,
+                dump_json(match).decode("utf-8"),  # TEXT: SQLite JSON functions treat BLOBs as JSONB
                 source_file,
                 ingested_at,
             )
         )
 
-    conn.executemany(
-        """
-        INSERT OR REPLACE INTO events_raw
-        (match_id, event_id, index_in_file, period, timestamp, minute, second,
-         type_name, possession, team_id, player_id, json, source_file, ingested_at)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """,
-        rows,
+    # One statement for the whole match file
+    conn.executemany(UPSERT_MATCHES_SQL, rows)
+
+
+def event_rows(match_id, events, keep_raw_json=True):
+    """Yield one events_raw row tuple (EVENT_COLUMNS order) per event."""
+    raw_json = dump_json if keep_raw_json else (lambda ev: None)
+
+    for idx, ev in enumerate(events):
+        yield (
+            match_id,
+            ev.get("id"),
+            idx,
+            ev.get("period"),
+            ev.get("timestamp"),
+            ev.get("minute"),
+            ev.get("second"),
+            (ev.get("type") or {}).get("name"),
+            ev.get("possession"),
+            (ev.get("team") or {}).get("id"),
+            (ev.get("player") or {}).get("id"),
+            *flatten_event(ev),
+            raw_json(ev),
+        )
+
+
+def load_event_rows(match_id, path, keep_raw_json=True) -> List[Tuple[Any, ...]]:
+    """Worker process: parse, flatten and serialize one events file into ready-to-insert rows."""
+    return list(event_rows(match_id, load_json(path), keep_raw_json))
+
+
+def insert_events(conn, match_id, rows, source_file, ingested_at):
+    # `rows` may be a generator; executemany consumes it one row at a time
+    conn.executemany(UPSERT_EVENTS_SQL, rows)
+    conn.execute(UPSERT_EVENT_FILES_SQL, (match_id, source_file, ingested_at))
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser(description="Ingest StatsBomb open-data matches and events into SQLite.")
+    p.add_argument(
+        "--no-raw-json",
+        action="store_true",
+        help="Only store the flat event columns, leave events_raw.json NULL (much smaller DB).",
     )
+    p.add_argument(
+        "--stream-events",
+        action="store_true",
+        help="Stream each events file with ijson instead of loading whole files in worker processes. "
+             "Memory stays constant per file, but parsing and flattening all run in the single writer "
+             "process, so it is slower.",
+    )
+    return p.parse_args()
 
 
 def main():
+    args = parse_args()
+
     # --- Debug prints to avoid "I don't know where it's looking" ---
     print("PROJECT_DIR:", PROJECT_DIR)
     print("DATA_DIR:", DATA_DIR)
@@ -144,38 +461,85 @@ def main():
     ingested_at = datetime.utcnow().isoformat(timespec="seconds") + "Z"
 
     conn = sqlite3.connect(DB_PATH)
-    ensure_schema(conn)
-
-    match_files = sorted(MATCHES_DIR.glob("*/*.json"))
+    configure_connection(conn)
+    # One transaction from schema migration to the last event row: either all of it lands or none
+    conn.execute("BEGIN")
+    ensure_schema_preload(conn, keep_raw_json=not args.no_raw_json)
+    drop_indexes_preload(conn)
+
+    match_files = list_match_files(MATCHES_DIR)
+    event_files = list_event_files(EVENTS_DIR)
     print(f"Found match files: {len(match_files)}")
 
     imported_match_files = 0
     imported_events_files = 0
+    event_jobs = []
 
-    for mf in match_files:
-        competition_id = int(mf.parent.name)
-        season_id = int(mf.stem)
-
+    for competition_id, season_id, mf in match_files:
         matches = load_json(mf)
 
         # 1) Matches
-        for m in matches:
-            upsert_match(conn, m, competition_id, season_id, str(mf), ingested_at)
+        upsert_matches(conn, matches, competition_id, season_id, mf, ingested_at)
 
-        # 2) Events for each match (if present)
+        # 2) Collect event files for each match (if present)
         for m in matches:
             match_id = m["match_id"]
-            ev_path = EVENTS_DIR / f"{match_id}.json"
-            if not ev_path.exists():
+            ev_name = f"{match_id}.json"
+            if ev_name not in event_files:
                 continue
-            events = load_json(ev_path)
-            insert_events(conn, match_id, events, str(ev_path), ingested_at)
-            imported_events_files += 1
+            event_jobs.append((match_id, os.path.join(EVENTS_DIR, ev_name)))
 
-        conn.commit()
         imported_match_files += 1
         print(f"Imported match-file: {mf} (competition={competition_id}, season={season_id})")
 
+    # 3) Events
+    keep_raw_json = not args.no_raw_json
+    stream_events = args.stream_events and ijson_available()
+    if args.stream_events and not stream_events:
+        print("ijson not available. Falling back to parsing whole event files.")
+
+    if stream_events:
+        # Events go from disk straight into the executemany generator, one at a time
+        print(f"Event files to import: {len(event_jobs)} (streaming with ijson)")
+        for match_id, ev_path in event_jobs:
+            rows = event_rows(match_id, iter_events(ev_path), keep_raw_json)
+            insert_events(conn, match_id, rows, ev_path, ingested_at)
+            imported_events_files += 1
+            if imported_events_files % 100 == 0:
+                print(f"Imported event files: {imported_events_files}/{len(event_jobs)}")
+    else:
+        # Worker processes parse, flatten and serialize whole files into row tuples; this process
+        # is the single SQLite writer and only runs executemany. Work is submitted continuously,
+        # with at most max_pending files held ahead of the writer.
+        max_workers = max(1, (os.cpu_count() or 2) - 1)
+        max_pending = max_workers * 4
+        print(f"Event files to import: {len(event_jobs)} (parse workers: {max_workers})")
+
+        jobs = iter(event_jobs)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            pending = deque(
+                (match_id, ev_path, executor.submit(load_event_rows, match_id, ev_path, keep_raw_json))
+                for match_id, ev_path in islice(jobs, max_pending)
+            )
+            while pending:
+                match_id, ev_path, future = pending.popleft()
+                rows = future.result()
+                for next_match_id, next_ev_path in islice(jobs, 1):
+                    pending.append((
+                        next_match_id,
+                        next_ev_path,
+                        executor.submit(load_event_rows, next_match_id, next_ev_path, keep_raw_json),
+                    ))
+                insert_events(conn, match_id, rows, ev_path, ingested_at)
+                imported_events_files += 1
+                if imported_events_files % 100 == 0 or not pending:
+                    print(f"Imported event files: {imported_events_files}/{len(event_jobs)}")
+
+    # Commits the schema migration and every row together (transaction opened before the migration)
+    conn.commit()
+
+    print("Creating indexes...")
+    create_indexes_postload(conn)
     conn.close()
     print(f"Done. Imported match files: {imported_match_files}, event files: {imported_events_files}")
     print(f"SQLite DB saved as: {DB_PATH}")
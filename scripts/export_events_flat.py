@@ -1,9 +1,11 @@
 import argparse
 import csv
-import json
+import queue
 import sqlite3
+import threading
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, List, Optional, Tuple
 
 PROJECT_DIR = Path(__file__).resolve().parents[1]
 DB_PATH = PROJECT_DIR / "statsbomb_raw.sqlite"
@@ -31,109 +33,44 @@ COLUMNS = [
     "duel_type", "foul_committed", "foul_won",
 ]
 
+# events_raw column feeding each output column (flat columns are filled by the ingest)
+SOURCE_COLUMNS = {"event_type": "type_name"}
 
-def safe_get(d: Any, *keys: str) -> Any:
-    """Safely get nested dict values; returns None if missing."""
-    cur = d
-    for k in keys:
-        if not isinstance(cur, dict):
-            return None
-        cur = cur.get(k)
-        if cur is None:
-            return None
-    return cur
-
-
-def get_location_xy(loc: Any) -> Tuple[Optional[float], Optional[float]]:
-    if isinstance(loc, list) and len(loc) >= 2:
-        return loc[0], loc[1]
-    return None, None
-
-
-def flatten_event(ev: Dict[str, Any], match_id: int, index_in_file: Optional[int]) -> Dict[str, Any]:
-    # Common
-    event_type = safe_get(ev, "type", "name")
-    team_id = safe_get(ev, "team", "id")
-    player_id = safe_get(ev, "player", "id")
-
-    x, y = get_location_xy(ev.get("location"))
-
-    row: Dict[str, Any] = {c: None for c in COLUMNS}
-    row.update({
-        "match_id": match_id,
-        "event_id": ev.get("id"),
-        "index_in_file": index_in_file,
-        "period": ev.get("period"),
-        "timestamp": ev.get("timestamp"),
-        "minute": ev.get("minute"),
-        "second": ev.get("second"),
-        "event_type": event_type,
-        "possession": ev.get("possession"),
-        "play_pattern": safe_get(ev, "play_pattern", "name"),
-        "team_id": team_id,
-        "player_id": player_id,
-        "x": x,
-        "y": y,
-    })
-
-    # PASS
-    if event_type == "Pass" and isinstance(ev.get("pass"), dict):
-        p = ev["pass"]
-        end_x, end_y = get_location_xy(p.get("end_location"))
-        row["end_x"] = end_x
-        row["end_y"] = end_y
-        row["pass_length"] = p.get("length")
-        row["pass_height"] = safe_get(p, "height", "name")
-        row["pass_outcome"] = safe_get(p, "outcome", "name")
-        row["pass_cross"] = p.get("cross")
-        row["pass_switch"] = p.get("switch")
-
-    # SHOT
-    elif event_type == "Shot" and isinstance(ev.get("shot"), dict):
-        s = ev["shot"]
-        end_x, end_y = get_location_xy(s.get("end_location"))
-        row["end_x"] = end_x
-        row["end_y"] = end_y
-        row["shot_outcome"] = safe_get(s, "outcome", "name")
-        row["shot_body_part"] = safe_get(s, "body_part", "name")
-        row["shot_type"] = safe_get(s, "type", "name")
-        row["shot_xg"] = s.get("statsbomb_xg")
-
-    # CARRY
-    elif event_type == "Carry" and isinstance(ev.get("carry"), dict):
-        c = ev["carry"]
-        end_x, end_y = get_location_xy(c.get("end_location"))
-        row["end_x"] = end_x
-        row["end_y"] = end_y
-        # simple carry length
-        if x is not None and y is not None and end_x is not None and end_y is not None:
-            dx = float(end_x) - float(x)
-            dy = float(end_y) - float(y)
-            row["carry_length"] = (dx * dx + dy * dy) ** 0.5
-
-    # DUEL
-    if event_type == "Duel" and isinstance(ev.get("duel"), dict):
-        d = ev["duel"]
-        row["duel_type"] = safe_get(d, "type", "name")
-
-    # FOUL
-    if event_type == "Foul Committed":
-        row["foul_committed"] = True
-    if event_type == "Foul Won":
-        row["foul_won"] = True
-
-    return row
-
-
-def chunked(iterable: Iterable[Any], size: int) -> Iterable[List[Any]]:
-    buf: List[Any] = []
-    for x in iterable:
-        buf.append(x)
-        if len(buf) >= size:
-            yield buf
-            buf = []
-    if buf:
-        yield buf
+# Arrow type of each output column: the Parquet schema is fixed up front
+# (a batch where a column happens to be all-None would otherwise be inferred as null)
+_INT = ["match_id", "index_in_file", "period", "minute", "second", "possession", "team_id", "player_id"]
+_FLOAT = ["x", "y", "end_x", "end_y", "pass_length", "shot_xg", "carry_length"]
+_BOOL = ["pass_cross", "pass_switch", "foul_committed", "foul_won"]
+ARROW_TYPES = {
+    c: "int64" if c in _INT else "double" if c in _FLOAT else "bool" if c in _BOOL else "string"
+    for c in COLUMNS
+}
+
+# Flat boolean columns are stored as 0/1; read them back as bools (only called for non-NULL values)
+sqlite3.register_converter("BOOLEAN", lambda v: v != b"0")
+
+
+def connect_readonly(**kwargs: Any) -> sqlite3.Connection:
+    # Read-only, memory-mapped: fetched pages come straight from the OS page cache
+    conn = sqlite3.connect(f"{DB_PATH.as_uri()}?mode=ro", uri=True, **kwargs)
+    conn.execute("PRAGMA mmap_size=1073741824")
+    conn.execute("PRAGMA cache_size=-200000")
+    return conn
+
+
+def fetch_chunks(cur: sqlite3.Cursor, out: queue.Queue, size: int, stop: threading.Event) -> None:
+    """Producer thread: put fetched row chunks on `out`, then None (or the exception raised).
+    Stops fetching once `stop` is set."""
+    try:
+        while not stop.is_set():
+            chunk = cur.fetchmany(size)
+            if not chunk:
+                break
+            out.put(chunk)
+    except BaseException as e:
+        out.put(e)
+        return
+    out.put(None)
 
 
 def fetch_match_ids(conn: sqlite3.Connection, competition_id: int, season_id: int) -> List[int]:
@@ -149,37 +86,162 @@ def ensure_output_dir(path: Path) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
 
 
-def write_csv(rows: List[Dict[str, Any]], out_path: Path, write_header: bool) -> None:
+def write_csv(rows: List[Tuple[Any, ...]], out_path: Path, write_header: bool) -> None:
     ensure_output_dir(out_path)
     mode = "w" if write_header else "a"
     with out_path.open(mode, newline="", encoding="utf-8") as f:
-        w = csv.DictWriter(f, fieldnames=COLUMNS)
+        w = csv.writer(f)
         if write_header:
-            w.writeheader()
+            w.writerow(COLUMNS)
         w.writerows(rows)
 
 
-def parquet_available() -> bool:
+def arrow_available() -> bool:
     try:
         import pyarrow
-        import pandas
+        import pyarrow.csv
+        import pyarrow.parquet
         return True
     except Exception:
         return False
 
 
-def write_parquet_batch(rows: List[Dict[str, Any]], out_path: Path, first_batch: bool) -> None:
-    """
-    Writes Parquet in batches. We use pandas+pyarrow.
-    If file exists, we append by writing a new file per batch (simple & robust),
-    then you can concatenate later. To keep MVP usable, we write:
-      - events_flat_..._part000.parquet, part001.parquet, ...
+def arrow_schema():
+    import pyarrow as pa
+
+    return pa.schema([(c, pa.type_for_alias(ARROW_TYPES[c])) for c in COLUMNS])
+
+
+def to_arrow_table(rows: List[Tuple[Any, ...]], schema) -> Any:
+    import pyarrow as pa
+
+    # Transpose the row tuples once, then build each typed column in C
+    columns = zip(*rows)
+    return pa.Table.from_arrays(
+        [pa.array(col, type=field.type) for col, field in zip(columns, schema)],
+        schema=schema,
+    )
+
+
+def create_selection(conn: sqlite3.Connection, match_ids: List[int], limit_players: Optional[List[int]]) -> str:
+    """Fill the temp selection tables on `conn`; returns the player JOIN clause (or "")."""
+    cur = conn.cursor()
+
+    # Create temp table for fast join rather than huge IN
+    cur.execute("DROP TABLE IF EXISTS temp_selected_matches;")
+    cur.execute("CREATE TEMP TABLE temp_selected_matches (match_id INTEGER PRIMARY KEY);")
+    cur.executemany("INSERT INTO temp_selected_matches(match_id) VALUES (?);", [(mid,) for mid in match_ids])
+    conn.commit()
+
+    # Optional players filter via temp table
+    if not limit_players:
+        return ""
+    cur.execute("DROP TABLE IF EXISTS temp_selected_players;")
+    cur.execute("CREATE TEMP TABLE temp_selected_players (player_id INTEGER PRIMARY KEY);")
+    cur.executemany("INSERT INTO temp_selected_players(player_id) VALUES (?);", [(pid,) for pid in limit_players])
+    conn.commit()
+    return "JOIN temp_selected_players p ON e.player_id = p.player_id"
+
+
+def write_events(
+    conn: sqlite3.Connection,
+    player_join: str,
+    out_path: Path,
+    use_arrow: bool,
+    use_parquet: bool,
+    batch_size: int,
+    total_events: Optional[int] = None,
+) -> int:
+    """Stream the selected events from `conn` into one output file; returns rows written."""
+    cur = conn.cursor()
+
+    # Stream rows from SQLite. CROSS JOIN pins the selected matches as the outer loop, so
+    # events come out of idx_events_match_idx already in order (no temp B-tree sort).
+    select_cols = ", ".join(
+        f"e.{SOURCE_COLUMNS[c]} AS {c}" if c in SOURCE_COLUMNS else f"e.{c}" for c in COLUMNS
+    )
+    select_sql = f"""
+        SELECT {select_cols}
+        FROM temp_selected_matches m
+        CROSS JOIN events_raw e ON e.match_id = m.match_id
+        {player_join}
+        ORDER BY m.match_id, e.index_in_file
     """
-    import pandas as pd
+    # Temp tables are filled; nothing below writes
+    cur.execute("PRAGMA query_only=1")
+    cur.execute(select_sql)
 
-    ensure_output_dir(out_path)
-    df = pd.DataFrame(rows, columns=COLUMNS)
-    df.to_parquet(out_path, index=False)
+    exported = 0
+    header_written = False
+
+    # Arrow writers append each batch to one file (Parquet: one row group per batch)
+    arrow_writer = None
+    if use_arrow:
+        import pyarrow.csv as pacsv
+        import pyarrow.parquet as pq
+
+        schema = arrow_schema()
+        if use_parquet:
+            arrow_writer = pq.ParquetWriter(out_path, schema, compression="zstd")
+        else:
+            arrow_writer = pacsv.CSVWriter(out_path, schema)
+
+    # SQLite fetches the next batches (GIL released) while this thread converts and writes.
+    # Each fetched batch is written as is: one Parquet row group / CSV chunk of batch_size rows.
+    batches: queue.Queue = queue.Queue(maxsize=4)
+    stop = threading.Event()
+    producer = threading.Thread(target=fetch_chunks, args=(cur, batches, batch_size, stop), daemon=True)
+    producer.start()
+
+    try:
+        while True:
+            batch = batches.get()
+            if batch is None:
+                break
+            if isinstance(batch, BaseException):
+                raise batch
+
+            if arrow_writer is not None:
+                arrow_writer.write_table(to_arrow_table(batch, schema))
+            else:
+                write_csv(batch, out_path, write_header=(not header_written))
+                header_written = True
+
+            exported += len(batch)
+            if total_events:
+                pct = exported / total_events * 100
+                print(f"Exported {exported}/{total_events} ({pct:.1f}%)")
+    finally:
+        # On error the producer may still be in fetchmany() or blocked on put(): stop it and
+        # drain the queue until it exits, so the caller can safely close the connection
+        stop.set()
+        while producer.is_alive():
+            try:
+                batches.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        producer.join()
+
+        if arrow_writer is not None:
+            arrow_writer.close()
+    return exported
+
+
+def export_part(
+    out_path: Path,
+    match_ids: List[int],
+    limit_players: Optional[List[int]],
+    use_arrow: bool,
+    use_parquet: bool,
+    batch_size: int,
+) -> int:
+    """Worker process: export one shard of matches over its own read-only connection."""
+    conn = connect_readonly(detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
+    try:
+        player_join = create_selection(conn, match_ids, limit_players)
+        return write_events(conn, player_join, out_path, use_arrow, use_parquet, batch_size)
+    finally:
+        conn.close()
 
 
 def export_events_flat(
@@ -188,13 +250,22 @@ def export_events_flat(
     out_dir: Path,
     limit_players: Optional[List[int]] = None,
     batch_size: int = 200_000,
+    out_format: str = "parquet",
+    workers: int = 1,
 ) -> None:
     if not DB_PATH.exists():
         raise FileNotFoundError(f"DB not found: {DB_PATH}. Run ingest first.")
 
-    conn = sqlite3.connect(DB_PATH)
+    # check_same_thread=False: rows are fetched on a producer thread (the main thread waits meanwhile)
+    conn = connect_readonly(detect_types=sqlite3.PARSE_DECLTYPES, check_same_thread=False)
     cur = conn.cursor()
 
+    existing = {r[1] for r in conn.execute("PRAGMA table_info(events_raw)")}
+    missing = [c for c in COLUMNS if SOURCE_COLUMNS.get(c, c) not in existing]
+    if missing:
+        conn.close()
+        raise ValueError(f"events_raw is missing columns {missing}. Re-run ingest first.")
+
     match_ids = fetch_match_ids(conn, competition_id, season_id)
     if not match_ids:
         conn.close()
@@ -203,22 +274,39 @@ def export_events_flat(
     print(f"Selected league/season: competition_id={competition_id}, season_id={season_id}")
     print(f"Matches found: {len(match_ids)}")
 
-    # Create temp table for fast join rather than huge IN
-    cur.execute("DROP TABLE IF EXISTS temp_selected_matches;")
-    cur.execute("CREATE TEMP TABLE temp_selected_matches (match_id INTEGER PRIMARY KEY);")
-    cur.executemany("INSERT INTO temp_selected_matches(match_id) VALUES (?);", [(mid,) for mid in match_ids])
-    conn.commit()
+    player_join = create_selection(conn, match_ids, limit_players)
+
+    # Columns added to an old DB stay NULL until its events are re-ingested. That ingest records
+    # the match in event_files_raw and fills play_pattern, which every StatsBomb event has;
+    # provenance migrated from an old DB gives the former without the latter.
+    has_files = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'event_files_raw'"
+    ).fetchone()
+    not_recorded = (
+        "NOT EXISTS (SELECT 1 FROM event_files_raw f WHERE f.match_id = m.match_id)" if has_files else "1"
+    )
+    stale = [
+        r[0]
+        for r in conn.execute(
+            f"""
+            SELECT m.match_id
+            FROM temp_selected_matches m
+            WHERE EXISTS (SELECT 1 FROM events_raw e WHERE e.match_id = m.match_id)
+              AND ({not_recorded}
+                   OR NOT EXISTS (SELECT 1 FROM events_raw e WHERE e.match_id = m.match_id AND e.play_pattern IS NOT NULL))
+            ORDER BY m.match_id
+            """
+        )
+    ]
+    if stale:
+        conn.close()
+        raise ValueError(
+            f"{len(stale)} selected matches have events that were not ingested by the current ingest "
+            f"(first: {stale[:5]}). Re-run ingest first."
+        )
 
-    # Optional players filter via temp table
     if limit_players:
-        cur.execute("DROP TABLE IF EXISTS temp_selected_players;")
-        cur.execute("CREATE TEMP TABLE temp_selected_players (player_id INTEGER PRIMARY KEY);")
-        cur.executemany("INSERT INTO temp_selected_players(player_id) VALUES (?);", [(pid,) for pid in limit_players])
-        conn.commit()
-        player_join = "JOIN temp_selected_players p ON e.player_id = p.player_id"
         print(f"Player filter enabled: {len(limit_players)} players")
-    else:
-        player_join = ""
 
     # Count events
     count_sql = f"""
@@ -234,65 +322,56 @@ def export_events_flat(
     base_name = f"events_flat_league_{competition_id}_{season_id}"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    use_parquet = parquet_available()
+    use_arrow = arrow_available()
+    use_parquet = use_arrow and out_format == "parquet"
+    suffix = ".parquet" if use_parquet else ".csv"
     if use_parquet:
-        print("Parquet support detected (pandas+pyarrow). Will write partitioned Parquet files.")
+        print("Parquet support detected (pyarrow). Will write Parquet.")
+    elif out_format == "parquet":
+        print("Parquet not available (missing pyarrow). Will write CSV.")
     else:
-        print("Parquet not available (missing pandas/pyarrow). Will write a single CSV file.")
+        print(f"Will write CSV ({'pyarrow' if use_arrow else 'csv module'}).")
 
-    # Stream rows from SQLite
-    select_sql = f"""
-        SELECT e.match_id, e.event_id, e.index_in_file, e.json
-        FROM events_raw e
-        JOIN temp_selected_matches m ON e.match_id = m.match_id
-        {player_join}
-        ORDER BY e.match_id, e.index_in_file
-    """
-    cur.execute(select_sql)
+    if workers <= 1:
+        out_path = out_dir / f"{base_name}{suffix}"
+        try:
+            write_events(conn, player_join, out_path, use_arrow, use_parquet, batch_size, total_events)
+        finally:
+            conn.close()
+        print(f"Done. Wrote {'Parquet' if use_parquet else 'CSV'} to: {out_path}")
+        return
 
-    exported = 0
-    part = 0
-    header_written = False
-    csv_path = out_dir / f"{base_name}.csv"
+    conn.close()
 
-    while True:
-        chunk = cur.fetchmany(50_000)
-        if not chunk:
-            break
+    # One contiguous shard of matches per part file, each exported by its own process and
+    # read-only connection (WAL readers don't block each other)
+    match_ids.sort()
+    shard_size = -(-len(match_ids) // workers)
+    shards = [match_ids[i:i + shard_size] for i in range(0, len(match_ids), shard_size)]
+    print(f"Exporting {len(shards)} parts with {len(shards)} worker processes")
 
-        rows: List[Dict[str, Any]] = []
-        for match_id, event_id, index_in_file, js in chunk:
-            try:
-                ev = json.loads(js)
-            except Exception:
-                continue
-            row = flatten_event(ev, match_id=match_id, index_in_file=index_in_file)
-            # redundancy ensure ids align
-            row["event_id"] = event_id
-            rows.append(row)
-
-        # Write out in big batches
-        for batch in chunked(rows, batch_size):
-            if use_parquet:
-                part_path = out_dir / f"{base_name}_part{part:03d}.parquet"
-                write_parquet_batch(batch, part_path, first_batch=(part == 0))
-                part += 1
-            else:
-                write_csv(batch, csv_path, write_header=(not header_written))
-                header_written = True
-
-            exported += len(batch)
+    exported = 0
+    with ProcessPoolExecutor(max_workers=len(shards)) as executor:
+        futures = {
+            executor.submit(
+                export_part,
+                out_dir / f"{base_name}_part{i:02d}{suffix}",
+                shard,
+                limit_players,
+                use_arrow,
+                use_parquet,
+                batch_size,
+            ): i
+            for i, shard in enumerate(shards)
+        }
+        for fut in as_completed(futures):
+            exported += fut.result()
             if total_events:
                 pct = exported / total_events * 100
-                print(f"Exported {exported}/{total_events} ({pct:.1f}%)")
+                print(f"Exported part{futures[fut]:02d}: {exported}/{total_events} ({pct:.1f}%)")
 
-    conn.close()
-
-    if use_parquet:
-        print(f"Done. Wrote {part} parquet part files to: {out_dir}")
-        print(f"Pattern: {base_name}_partXXX.parquet")
-    else:
-        print(f"Done. Wrote CSV to: {csv_path}")
+    print(f"Done. Wrote {len(shards)} parts to: {out_dir}")
+    print(f"Pattern: {base_name}_partXX{suffix}")
 
 
 def parse_args() -> argparse.Namespace:
@@ -301,7 +380,11 @@ def parse_args() -> argparse.Namespace:
     p.add_argument("--season-id", type=int, required=True)
     p.add_argument("--out-dir", type=str, default=str(PROJECT_DIR / "output"))
     p.add_argument("--players", type=str, default="", help="Comma-separated player_ids to filter (optional).")
-    p.add_argument("--batch-size", type=int, default=200_000, help="Rows per output batch (parquet parts / csv chunks).")
+    p.add_argument("--format", choices=["parquet", "csv"], default="parquet",
+                   help="Output format (CSV is always used when pyarrow is missing).")
+    p.add_argument("--batch-size", type=int, default=200_000, help="Rows per output batch (parquet row groups / csv chunks).")
+    p.add_argument("--workers", type=int, default=1,
+                   help="Export N shards of matches in parallel processes, one _partXX file each (default: 1 file).")
     return p.parse_args()
 
 
@@ -319,6 +402,8 @@ def main() -> None:
         out_dir=out_dir,
         limit_players=players,
         batch_size=args.batch_size,
+        out_format=args.format,
+        workers=args.workers,
     )
 
 
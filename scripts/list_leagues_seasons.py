@@ -1,84 +1,58 @@
-import json
 import sqlite3
 from pathlib import Path
-from collections import defaultdict
 
 PROJECT_DIR = Path(__file__).resolve().parents[1]
 DB_PATH = PROJECT_DIR / "statsbomb_raw.sqlite"
 
+# Same expressions as the matches_raw generated columns (MATCH_GENERATED_COLUMNS in the ingest),
+# used inline on DBs whose ingest predates those columns
+NAME_EXPRESSIONS = {
+    "competition_name": "coalesce(json_extract(json, '$.competition.competition_name'), "
+                        "json_extract(json, '$.competition.name'))",
+    "season_name": "coalesce(json_extract(json, '$.season.season_name'), json_extract(json, '$.season.name'))",
+    "country_name": "coalesce(json_extract(json, '$.country.name'), "
+                    "json_extract(json, '$.competition.country_name'))",
+}
+
 
 def main():
     if not DB_PATH.exists():
         raise FileNotFoundError(f"DB not found: {DB_PATH}. Run ingest first.")
 
-    conn = sqlite3.connect(DB_PATH)
+    # Read-only, memory-mapped, no writes at all
+    conn = sqlite3.connect(f"{DB_PATH.as_uri()}?mode=ro", uri=True)
+    conn.execute("PRAGMA mmap_size=1073741824")
+    conn.execute("PRAGMA cache_size=-200000")
+    conn.execute("PRAGMA query_only=1")
     cur = conn.cursor()
 
-    # Pull minimal fields
-    cur.execute("""
-        SELECT competition_id, season_id, match_date, json
+    # Names are generated columns over matches_raw.json (see ingest), so this is a plain GROUP BY;
+    # an older DB without them gets the same expressions evaluated in the query
+    existing = {r[1] for r in conn.execute("PRAGMA table_xinfo(matches_raw)")}
+    names = {c: c if c in existing else expr for c, expr in NAME_EXPRESSIONS.items()}
+
+    cur.execute(f"""
+        SELECT competition_id,
+               season_id,
+               coalesce(max({names["competition_name"]}), '') AS competition_name,
+               coalesce(max({names["season_name"]}), '')      AS season_name,
+               coalesce(max({names["country_name"]}), '')     AS country,
+               count(*)                            AS matches,
+               coalesce(min(match_date), '')       AS min_date,
+               coalesce(max(match_date), '')       AS max_date
         FROM matches_raw
+        GROUP BY competition_id, season_id
+        ORDER BY competition_name, season_name, competition_id, season_id
     """)
-
-    agg = defaultdict(lambda: {
-        "matches": 0,
-        "min_date": None,
-        "max_date": None,
-        "competition_name": None,
-        "season_name": None,
-        "country_name": None,
-    })
-
-    for competition_id, season_id, match_date, js in cur.fetchall():
-        key = (competition_id, season_id)
-        row = agg[key]
-        row["matches"] += 1
-
-        # dates
-        if match_date:
-            if row["min_date"] is None or match_date < row["min_date"]:
-                row["min_date"] = match_date
-            if row["max_date"] is None or match_date > row["max_date"]:
-                row["max_date"] = match_date
-
-        # names from JSON
-        if row["competition_name"] is None or row["season_name"] is None or row["country_name"] is None:
-            try:
-                m = json.loads(js)
-            except Exception:
-                continue
-
-            comp = (m.get("competition") or {})
-            season = (m.get("season") or {})
-            country = (m.get("country") or {})
-
-            row["competition_name"] = row["competition_name"] or comp.get("competition_name") or comp.get("name")
-            row["season_name"] = row["season_name"] or season.get("season_name") or season.get("name")
-            row["country_name"] = row["country_name"] or country.get("name")
+    rows = cur.fetchall()
 
     conn.close()
 
-    # Print as a sorted table
-    rows = []
-    for (competition_id, season_id), v in agg.items():
-        rows.append({
-            "competition_id": competition_id,
-            "season_id": season_id,
-            "competition_name": v["competition_name"] or "",
-            "season_name": v["season_name"] or "",
-            "country": v["country_name"] or "",
-            "matches": v["matches"],
-            "min_date": v["min_date"] or "",
-            "max_date": v["max_date"] or "",
-        })
-
-    rows.sort(key=lambda r: (r["competition_name"], r["season_name"], r["competition_id"], r["season_id"]))
-
     # Pretty print 
     header = ["competition_id", "season_id", "competition_name", "season_name", "country", "matches", "min_date", "max_date"]
     print("\t".join(header))
     for r in rows:
-        print("\t".join(str(r[h]) for h in header))
+        print("\t".join(str(v) for v in r))
 
     print(f"\nTotal league/season pairs: {len(rows)}")
 